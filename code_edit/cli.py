@@ -1,7 +1,11 @@
 """
 CLI interface for code-edit tool.
 """
+import asyncio
+import functools
+import mmap
 import os
+import stat
 import sys
 import time
 import shutil
@@ -9,30 +13,99 @@ from pathlib import Path
 from typing import Optional, List, Tuple
 import click
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TimeElapsedColumn
 from rich.table import Table
 from rich.live import Live
-from code_edit.core.processor import CodeProcessor
-from code_edit.core.diff import create_diff_view
 
 console = Console()
 
+# Upper bound on in-flight API requests, to stay under rate limits
+MAX_CONCURRENT_REQUESTS = 8
+
+# Files below this size are read with plain buffered I/O, since mmap
+# setup costs more than it saves on small inputs
+MMAP_THRESHOLD = 16384
+
+def read_text(path) -> str:
+    """Read a file as UTF-8, memory-mapping large files.
+
+    Mapping the file lets the OS page cache satisfy reads directly and
+    skips Python's buffered I/O chunk loop, leaving a single decode as
+    the only copy.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            return f.read().decode('utf-8')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm[:].decode('utf-8')
+
+def write_text(path, content: str) -> None:
+    """Write UTF-8 content to a file atomically.
+
+    Encodes once and writes through a raw file descriptor, skipping the
+    TextIOWrapper/buffered-writer stack; writing to a temp file and
+    os.replace-ing it in keeps readers from ever seeing partial output.
+    """
+    data = content.encode('utf-8')
+    tmp_path = f"{path}.tmp"
+
+    # Carry the destination's permissions over to the temp file so the
+    # replace doesn't strip e.g. executable bits when editing in place
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        mode = 0o644
+
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+        try:
+            # os.write may write fewer bytes than asked; loop so a short
+            # write can't end up replaced into place as truncated output
+            remaining = memoryview(data)
+            while remaining:
+                remaining = remaining[os.write(fd, remaining):]
+        finally:
+            os.close(fd)
+        # chmod explicitly since the umask may have masked bits out of
+        # the mode passed to os.open; by path rather than fchmod, which
+        # doesn't exist on Windows
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Don't leave a stray .tmp file behind on a failed write
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
 def get_terminal_size() -> Tuple[int, int]:
     """Get the current terminal size."""
     width, height = shutil.get_terminal_size()
     # Reserve some space for other content (status messages, etc.)
     return width, max(10, height - 5)
 
+@functools.lru_cache(maxsize=4096)
+def _is_regular_file(path: str) -> bool:
+    """Check whether a path is a regular file, with one stat per path.
+
+    Cached so a path validated as an argument and seen again (e.g. via
+    stdin) doesn't stat twice.
+    """
+    try:
+        return stat.S_ISREG(os.stat(path).st_mode)
+    except OSError:
+        return False
+
 def validate_file(ctx, param, value):
     """Validate that the file exists and is readable."""
     if value is None:
         return None
     
     try:
-        path = Path(value)
-        if not path.is_file():
+        if not _is_regular_file(str(value)):
             raise click.BadParameter(f"File {value} does not exist")
-        return path
+        return Path(value)
     except Exception as e:
         raise click.BadParameter(str(e))
 
@@ -44,13 +117,12 @@ def validate_files(ctx, param, value):
     valid_files = []
     for file_path in value:
         try:
-            path = Path(file_path)
-            if not path.is_file():
+            if not _is_regular_file(str(file_path)):
                 raise click.BadParameter(f"File {file_path} does not exist")
-            valid_files.append(path)
+            valid_files.append(Path(file_path))
         except Exception as e:
             raise click.BadParameter(str(e))
-    
+
     return valid_files
 
 @click.command()
@@ -66,8 +138,7 @@ def cli(prompt: Optional[str], prompt_file: Optional[str], files: List[Path],
     try:
         # Get prompt from file if specified
         if prompt_file and not prompt:
-            with open(prompt_file) as f:
-                prompt = f.read().strip()
+            prompt = read_text(prompt_file).strip()
         
         if not prompt:
             raise click.UsageError("Either --prompt or --prompt-file must be specified")
@@ -75,19 +146,28 @@ def cli(prompt: Optional[str], prompt_file: Optional[str], files: List[Path],
         # Get files from stdin if no files are provided as arguments
         file_paths = list(files)
         if not file_paths and not sys.stdin.isatty():
-            # Read filenames from stdin (one per line)
+            # Read filenames from stdin (one per line). Bind the lookups
+            # once; per-iteration attribute dispatch adds up when tens of
+            # thousands of paths are piped in
+            is_file = _is_regular_file
+            add_path = file_paths.append
             for line in sys.stdin:
-                file_path = line.strip()
+                file_path = line.rstrip('\n')
                 if file_path:
-                    path = Path(file_path)
-                    if path.is_file():
-                        file_paths.append(path)
+                    if is_file(file_path):
+                        add_path(Path(file_path))
                     else:
                         console.print(f"[yellow]Warning: File {file_path} does not exist or is not readable, skipping[/yellow]")
         
         if not file_paths:
             raise click.UsageError("No valid files provided. Provide files as arguments or pipe filenames (one per line)")
         
+        # Import lazily so --help and argument errors never pay the cost
+        # of loading the AI client stack
+        from code_edit.core.processor import CodeProcessor
+        from code_edit.core.diff import create_diff_view
+        from rich.progress import Progress, SpinnerColumn, TimeElapsedColumn
+
         # Initialize processor
         processor = CodeProcessor()
         
@@ -95,7 +175,7 @@ def cli(prompt: Optional[str], prompt_file: Optional[str], files: List[Path],
         info = processor.get_model_info()
         console.print(f"[cyan]Using model:[/cyan] [green]{info.get('model', 'Unknown')}[/green]")
         console.print(f"[cyan]      Files:[/cyan] [green]{', '.join(str(f) for f in file_paths)}[/green]")
-        
+
         # Create output directory if specified
         output_directory = None
         if output_dir:
@@ -105,37 +185,71 @@ def cli(prompt: Optional[str], prompt_file: Optional[str], files: List[Path],
         total_files = len(file_paths)
         files_processed = 0       
 
-        # Process each file
-        for i, file in enumerate(file_paths):
-            # Apply delay between files (not before the first file)
-            if i > 0 and delay > 0:
-                console.print(f"[yellow]Waiting {delay} seconds before processing next file...[/yellow]")
-                time.sleep(delay)
-                
-            console.print(f"[bold blue]Processing {file}...[/bold blue]")
-            
-            # Read input file
-            with open(file) as f:
-                original_code = f.read()
-            
-            # Process the code with progress tracking
-            with Progress(
-                SpinnerColumn(),
-                *Progress.get_default_columns(),
-                TimeElapsedColumn(),
-                console=console,
-                transient=False
-            ) as progress:
+        # Process files concurrently: each call is a multi-second network
+        # round-trip, so wall-clock for a batch is dominated by API latency
+        async def process_file(file: Path, progress, semaphore) -> Tuple[Path, str, str]:
+            async with semaphore:
+                # Read input file
+                original_code = read_text(file)
+
+                # Advance the task per streamed chunk so the bar reflects
+                # actual generation progress instead of sitting idle
                 task = progress.add_task(f"Processing {file.name}...", total=None)
-                modified_code = processor.process(original_code, prompt)
-                progress.update(task, completed=100)
-            
+                modified_code = await processor.aprocess(
+                    original_code, prompt,
+                    on_chunk=lambda n, task=task: progress.update(task, advance=n)
+                )
+                # Pin the total so the task renders as finished instead of
+                # spinning for the rest of the batch
+                progress.update(task, total=100, completed=100)
+                return file, original_code, modified_code
+
+        async def process_all(progress) -> List[Tuple[Path, str, str]]:
+            # Created here so the semaphore binds to the loop asyncio.run
+            # starts; on Python 3.8/3.9 constructing it outside would tie
+            # it to a different loop and acquire() would raise
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+            # Open the API connection before the batch so the first file
+            # doesn't pay the handshake on top of generation latency
+            await processor.warm_up()
+
+            if delay <= 0:
+                tasks = [process_file(file, progress, semaphore) for file in file_paths]
+                return await asyncio.gather(*tasks)
+
+            # Preserve --delay pacing by waiting between rounds of
+            # concurrent requests rather than between individual files
+            results = []
+            for start in range(0, len(file_paths), MAX_CONCURRENT_REQUESTS):
+                if start > 0:
+                    console.print(f"[yellow]Waiting {delay} seconds before processing next batch...[/yellow]")
+                    await asyncio.sleep(delay)
+                batch = file_paths[start:start + MAX_CONCURRENT_REQUESTS]
+                results.extend(await asyncio.gather(*(process_file(file, progress, semaphore) for file in batch)))
+            return results
+
+        with Progress(
+            SpinnerColumn(),
+            *Progress.get_default_columns(),
+            TimeElapsedColumn(),
+            console=console,
+            transient=False
+        ) as progress:
+            results = asyncio.run(process_all(progress))
+
+        # Show diffs and write results sequentially so the interactive
+        # Live views don't interleave
+        for file, original_code, modified_code in results:
             # Create and display the diff view with auto-resize capability
+            language = processor.detect_language(file) or "python"
+
             def generate_diff():
                 # Get current terminal dimensions
                 width, height = get_terminal_size()
                 # Create a diff view that fits the current terminal size
-                return create_diff_view(original_code, modified_code, max_height=height)
+                return create_diff_view(original_code, modified_code, max_height=height,
+                                        language=language)
             
             console.print(f"[bold cyan]Diff view for {file.name} (auto-adjusts on resize)[/bold cyan]")
             
@@ -156,8 +270,7 @@ def cli(prompt: Optional[str], prompt_file: Optional[str], files: List[Path],
                 output_file = output_directory / file.name
             
             # Write output
-            with open(output_file, 'w') as f:
-                f.write(modified_code)
+            write_text(output_file, modified_code)
             
             files_processed += 1
             files_remaining = total_files - files_processed
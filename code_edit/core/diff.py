@@ -2,7 +2,6 @@
 Diff generation functionality.
 """
 import difflib
-import re
 from typing import List, Tuple, Optional
 
 from rich.syntax import Syntax
@@ -13,166 +12,240 @@ from rich.text import Text
 from rich.style import Style
 from rich import box
 
+# rapidfuzz provides a C++ implementation of the opcode computation that
+# is an order of magnitude faster than difflib's pure-Python matcher;
+# fall back to difflib when it isn't installed
+try:
+    from rapidfuzz.distance import Levenshtein as _Levenshtein
+except ImportError:
+    _Levenshtein = None
+
+# Parsed once at import; passing Style objects instead of style strings
+# skips Rich's style-string parsing on every Text construction
+_RED = Style(color="red", bold=True)
+_GREEN = Style(color="green", bold=True)
+_BOLD = Style(bold=True)
+
+# Unchanged context lines shown around each hunk, matching unified-diff
+_CONTEXT_LINES = 3
+
+# Replaced line pairs below this similarity get plain removed/added rows:
+# the word-level matcher is at its slowest on unrelated lines and the
+# character-level highlights it produces there are unreadable anyway
+_WORD_DIFF_MIN_RATIO = 0.3
+
+def _word_diff_opcodes(old_text: str, new_text: str) -> List[Tuple[str, int, int, int, int]]:
+    """
+    Compute (tag, i1, i2, j1, j2) edit opcodes between two texts.
+
+    Uses rapidfuzz when available, otherwise difflib's SequenceMatcher.
+
+    Args:
+        old_text: The original text
+        new_text: The modified text
+
+    Returns:
+        A list of opcode tuples in difflib's get_opcodes format
+    """
+    if _Levenshtein is not None:
+        return [
+            (op.tag, op.src_start, op.src_end, op.dest_start, op.dest_end)
+            for op in _Levenshtein.opcodes(old_text, new_text)
+        ]
+    return difflib.SequenceMatcher(None, old_text, new_text).get_opcodes()
+
 def highlight_word_diff(old_text: str, new_text: str) -> Text:
     """
     Highlight word-level differences between two texts.
-    
+
     Args:
         old_text: The original text
         new_text: The modified text
-        
+
     Returns:
         A rich Text object with highlighted word differences
     """
     result = Text()
-    matcher = difflib.SequenceMatcher(None, old_text, new_text)
-    
-    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+
+    for op, i1, i2, j1, j2 in _word_diff_opcodes(old_text, new_text):
         if op == 'equal':
             result.append(old_text[i1:i2])
         elif op == 'delete':
             # Use bold red text instead of white on red background
-            result.append(old_text[i1:i2], style="bold red")
+            result.append(old_text[i1:i2], style=_RED)
         elif op == 'insert':
             # Use bold green text instead of white on green background
-            result.append(new_text[j1:j2], style="bold green")
+            result.append(new_text[j1:j2], style=_GREEN)
         elif op == 'replace':
-            result.append(old_text[i1:i2], style="bold red")
-            result.append(" → ", style="bold")
-            result.append(new_text[j1:j2], style="bold green")
+            result.append(old_text[i1:i2], style=_RED)
+            result.append(" → ", style=_BOLD)
+            result.append(new_text[j1:j2], style=_GREEN)
             
     return result
 
-def create_diff_view(original: str, modified: str, max_height: Optional[int] = None) -> Table:
+def highlight_lines(code: str, language: str) -> List[Text]:
+    """
+    Syntax-highlight a whole buffer in one pass and split it into lines.
+
+    Tokenizing the full buffer once amortizes the Pygments lexer setup
+    that per-line Syntax objects would otherwise repeat for every line.
+
+    Args:
+        code: The code to highlight
+        language: Pygments lexer name (e.g. "python")
+
+    Returns:
+        A list of rich Text objects, one per line of code
+    """
+    syntax = Syntax(code, language, theme="monokai")
+    return list(syntax.highlight(code).split("\n"))
+
+def _intern_lines(orig_lines: List[str], mod_lines: List[str]) -> Tuple[List[int], List[int]]:
+    """
+    Map each distinct line to a small integer id.
+
+    Diffing the id sequences lets the matcher compare lines with O(1)
+    integer equality instead of re-comparing full string contents, while
+    producing identical opcodes since equal ids mean equal lines.
+
+    Args:
+        orig_lines: Lines of the original buffer
+        mod_lines: Lines of the modified buffer
+
+    Returns:
+        A pair of id lists mirroring the two line lists
+    """
+    ids: dict = {}
+
+    def to_ids(lines: List[str]) -> List[int]:
+        get = ids.setdefault
+        return [get(line, len(ids)) for line in lines]
+
+    return to_ids(orig_lines), to_ids(mod_lines)
+
+def _new_diff_table() -> Table:
+    """
+    Create the empty two-column table used for diff views.
+
+    Returns:
+        A rich Table with line-number and changes columns
+    """
+    # The table auto-adjusts for width; the height is adjusted when the
+    # table is printed by the console
+    table = Table(show_header=True, header_style="bold", box=box.SIMPLE, expand=True)
+    table.add_column("Line", style="dim", width=10, no_wrap=True)
+    table.add_column("Changes", style="none", ratio=1)
+    return table
+
+def create_diff_view(original: str, modified: str, max_height: Optional[int] = None,
+                     language: str = "python") -> Table:
     """
     Create a rich diff view comparing original and modified code.
-    
+
     Args:
         original: Original code content
         modified: Modified code content
         max_height: Maximum height for the table (None means no limit)
-        
+        language: Language used for syntax highlighting of unchanged lines
+
     Returns:
         A rich Table object showing the diff
     """
-    # Create a unified diff
-    diff = list(difflib.unified_diff(
-        original.splitlines(keepends=True),
-        modified.splitlines(keepends=True),
-        fromfile='Original',
-        tofile='Modified',
-        lineterm=''
-    ))
-
-    # Create a table for the diff with auto-adjustment for width
-    # The height will be adjusted when the table is printed by the console
-    table = Table(show_header=True, header_style="bold", box=box.SIMPLE, expand=True)
-    table.add_column("Line", style="dim", width=10, no_wrap=True)
-    table.add_column("Changes", style="none", ratio=1)
-
-    # Check if there are any differences
-    if not diff:
+    # Identical buffers are common on no-op prompts; skip the line
+    # split and the whole diff computation for them
+    if original == modified:
+        table = _new_diff_table()
         table.add_row("", Panel(Text("No differences found", style="italic")))
         return table
 
-    # Process the diff lines
-    line_num_original = 0
-    line_num_modified = 0
-    hunk_pattern = re.compile(r'^@@ -(\d+),?(\d*) \+(\d+),?(\d*) @@')
-    
-    # Store matched line pairs for word diff
-    removed_lines = {}
-    added_lines = {}
-    last_removed_line = None
-    
-    # First pass: collect added and removed lines
-    temp_line_original = 0
-    temp_line_modified = 0
-    
-    for line in diff:
-        if line.startswith('---') or line.startswith('+++'):
-            continue
-            
-        if line.startswith('@@'):
-            match = hunk_pattern.match(line)
-            if match:
-                temp_line_original = int(match.group(1)) - 1
-                temp_line_modified = int(match.group(3)) - 1
-            continue
-            
-        if line.startswith('+'):
-            temp_line_modified += 1
-            added_lines[temp_line_modified] = line[1:]
-            if last_removed_line is not None:
-                # Try to match with the previous removed line
-                removed_lines[last_removed_line] = (temp_line_modified, removed_lines.get(last_removed_line, (None, None))[1])
-                last_removed_line = None
-        elif line.startswith('-'):
-            temp_line_original += 1
-            last_removed_line = temp_line_original
-            removed_lines[temp_line_original] = (None, line[1:])
-        else:
-            temp_line_original += 1
-            temp_line_modified += 1
-            last_removed_line = None
-    
-    # Second pass: create the diff view
-    line_num_original = 0
-    line_num_modified = 0
-    
-    for line in diff:
-        if line.startswith('---') or line.startswith('+++'):
-            continue
-            
-        if line.startswith('@@'):
-            match = hunk_pattern.match(line)
-            if match:
-                line_num_original = int(match.group(1)) - 1
-                line_num_modified = int(match.group(3)) - 1
-            continue
-            
-        if line.startswith('+'):
-            line_num_modified += 1
-            
-            # Check if this added line has a matching removed line
-            matched = False
-            for orig_line, (mod_line, orig_content) in removed_lines.items():
-                if mod_line == line_num_modified and orig_content is not None:
-                    # Found a matching line, show word diff
-                    matched = True
-                    word_diff = highlight_word_diff(orig_content, line[1:])
-                    table.add_row(f"+{line_num_modified}", word_diff)
-                    break
-            
-            if not matched:
-                # No match, show as a completely new line
-                # Use bold green text instead of white on green background
-                table.add_row(
-                    f"+{line_num_modified}",
-                    Text(line[1:], style="bold green")
-                )
-                
-        elif line.startswith('-'):
-            line_num_original += 1
-            
-            # Check if this has a matching added line
-            if line_num_original in removed_lines and removed_lines[line_num_original][0] is not None:
-                # This will be shown with word diff when we process the matching added line
-                continue
-            else:
-                # No match, show as a completely removed line
-                # Use bold red text instead of white on red background
-                table.add_row(
-                    f"-{line_num_original}",
-                    Text(line[1:], style="bold red")
-                )
-                
-        else:
-            line_num_original += 1
-            line_num_modified += 1
-            table.add_row(
-                f"{line_num_original}",
-                Syntax(line[1:], "python", theme="monokai")
-            )
+    orig_lines = original.splitlines()
+    mod_lines = modified.splitlines()
+
+    table = _new_diff_table()
+
+    # Grouped opcodes arrive already bucketed into hunks with trimmed
+    # context, so equal regions far from any change are never visited;
+    # diffing interned line ids keeps the matcher's comparisons O(1)
+    orig_ids, mod_ids = _intern_lines(orig_lines, mod_lines)
+    matcher = difflib.SequenceMatcher(None, orig_ids, mod_ids)
+    groups = list(matcher.get_grouped_opcodes(_CONTEXT_LINES))
+
+    # splitlines() drops the line terminators, so unequal buffers that
+    # produce no opcode groups differ only in line endings or a trailing
+    # newline — the identical-buffer case already returned above. Say so
+    # rather than claiming there are no differences
+    if not groups:
+        table.add_row("", Panel(Text("Only line-ending or trailing-newline changes", style="italic")))
+        return table
+
+    # Highlight the original buffer once; unchanged rows reuse these lines
+    highlighted = highlight_lines(original, language)
+
+    # Accumulate rows in a plain list first: list.append is far cheaper
+    # per row than Table.add_row, which validates cells and rebuilds
+    # column state on every call
+    rows: List[Tuple[str, Text]] = []
+    append = rows.append
+
+    # Single pass over the opcodes: replace/equal/insert/delete hunks arrive
+    # already paired, so matched removed/added lines need no bookkeeping
+    for group in groups:
+        for op, i1, i2, j1, j2 in group:
+            if op == 'equal':
+                for offset, line in enumerate(orig_lines[i1:i2]):
+                    index = i1 + offset
+                    append((
+                        f"{index + 1}",
+                        highlighted[index] if index < len(highlighted) else Text(line)
+                    ))
+            elif op == 'replace':
+                # Pair removed and added lines positionally for word-level diff
+                for offset, (old_line, new_line) in enumerate(zip(orig_lines[i1:i2], mod_lines[j1:j2])):
+                    # real_quick_ratio is an O(1) length-based upper bound, so
+                    # unrelated pairs are rejected without running the matcher
+                    ratio = difflib.SequenceMatcher(None, old_line, new_line).real_quick_ratio()
+                    if ratio < _WORD_DIFF_MIN_RATIO:
+                        append((
+                            f"-{i1 + offset + 1}",
+                            Text(old_line, style=_RED)
+                        ))
+                        append((
+                            f"+{j1 + offset + 1}",
+                            Text(new_line, style=_GREEN)
+                        ))
+                    else:
+                        append((
+                            f"+{j1 + offset + 1}",
+                            highlight_word_diff(old_line, new_line)
+                        ))
+                # Leftover lines when the replaced ranges have unequal lengths
+                paired = min(i2 - i1, j2 - j1)
+                for offset, line in enumerate(orig_lines[i1 + paired:i2]):
+                    append((
+                        f"-{i1 + paired + offset + 1}",
+                        Text(line, style=_RED)
+                    ))
+                for offset, line in enumerate(mod_lines[j1 + paired:j2]):
+                    append((
+                        f"+{j1 + paired + offset + 1}",
+                        Text(line, style=_GREEN)
+                    ))
+            elif op == 'delete':
+                for offset, line in enumerate(orig_lines[i1:i2]):
+                    append((
+                        f"-{i1 + offset + 1}",
+                        Text(line, style=_RED)
+                    ))
+            elif op == 'insert':
+                for offset, line in enumerate(mod_lines[j1:j2]):
+                    append((
+                        f"+{j1 + offset + 1}",
+                        Text(line, style=_GREEN)
+                    ))
+
+    # Flush the accumulated rows into the table in one tight loop
+    add_row = table.add_row
+    for line_no, content in rows:
+        add_row(line_no, content)
 
     return table
\ No newline at end of file
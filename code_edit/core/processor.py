@@ -1,16 +1,46 @@
 """
 Core code processing functionality.
 """
+import hashlib
 import os
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Callable, ClassVar, Optional, Dict
 
 import google.generativeai as genai
 
+# Built once at import; detect_language may run per file in multi-file
+# batches and shouldn't reconstruct the mapping each time
+_EXTENSION_MAP = {
+    '.py': 'python',
+    '.js': 'javascript',
+    '.ts': 'typescript',
+    '.java': 'java',
+    '.cpp': 'cpp',
+    '.c': 'c',
+    '.go': 'go',
+    '.rs': 'rust',
+    '.rb': 'ruby',
+    '.php': 'php',
+    '.cs': 'csharp',
+    '.swift': 'swift',
+    '.kt': 'kotlin',
+    '.scala': 'scala',
+}
+
 class CodeProcessor:
     """Handles code transformations using AI."""
 
     model_name = 'gemini-2.5-flash-preview-04-17'
+
+    # All values are static, so build the dict once at class creation
+    # instead of allocating a fresh one per get_model_info call
+    MODEL_INFO: ClassVar[Dict[str, str]] = {
+        "model": model_name,
+        "provider": "Google",
+        "type": "Large Language Model",
+        "capabilities": "Code editing, generation, and analysis"
+    }
+
     def __init__(self):
         """Initialize the processor with API credentials."""
         self.api_key = os.getenv('GOOGLE_API_KEY')
@@ -21,33 +51,53 @@ class CodeProcessor:
             )
         genai.configure(api_key=self.api_key)
         
-        # Configure the model
+        # Configure the model once and reuse it for every call
         self.model = genai.GenerativeModel(self.model_name)
 
+        # Cache responses per (code hash, prompt) so identical re-runs
+        # (e.g. previewing the same files twice) skip the API entirely
+        self._cache: Dict[tuple, str] = {}
+
+    async def warm_up(self) -> None:
+        """
+        Pre-establish the API connection with a cheap request.
+
+        The first real request of a batch otherwise pays TLS and
+        connection setup on top of generation latency. count_tokens goes
+        through the same async generative client as aprocess, so the
+        connection it opens is the one the batch reuses. Failures are
+        ignored; the actual requests will surface any real errors.
+        """
+        try:
+            await self.model.count_tokens_async("x")
+        except Exception:
+            pass
+
     def get_model_info(self) -> Dict[str, str]:
         """
         Get information about the current model configuration.
-        
+
         Returns:
             Dictionary containing model information
         """
-        return {
-            "model": self.model_name,
-            "provider": "Google",
-            "type": "Large Language Model",
-            "capabilities": "Code editing, generation, and analysis"
-        }
-
-    def process(self, code: str, prompt: str) -> str:
+        return self.MODEL_INFO
+
+    def _cache_key(self, code: str, prompt: str) -> tuple:
+        """Build a cache key from a digest of the code and the prompt."""
+        # Hash the code so cache keys stay small even for large files
+        code_hash = hashlib.blake2b(code.encode(), digest_size=16).hexdigest()
+        return (code_hash, prompt)
+
+    def _build_request(self, code: str, prompt: str) -> tuple:
         """
-        Process the code according to the prompt.
-        
+        Build the request contents and generation config for a code edit.
+
         Args:
             code: The original code to modify
             prompt: Natural language description of desired changes
-            
+
         Returns:
-            The modified code
+            A (contents, generation_config) tuple for generate_content
         """
         # Construct the system message and user prompt
         system_prompt = """You are an expert code editor. Your task is to modify the given code according to the user's prompt.
@@ -60,18 +110,93 @@ Here's the code to modify:
 
 {code}"""
 
-        # Get the AI response
+        generation_config = genai.types.GenerationConfig(
+            temperature=0.1,
+            candidate_count=1,
+            max_output_tokens=8192,
+        )
+        return [system_prompt, user_prompt], generation_config
+
+    def process(self, code: str, prompt: str,
+                on_chunk: Optional[Callable[[int], None]] = None) -> str:
+        """
+        Process the code according to the prompt.
+
+        Args:
+            code: The original code to modify
+            prompt: Natural language description of desired changes
+            on_chunk: Optional callback invoked with the length of each
+                streamed response chunk, for progress reporting
+
+        Returns:
+            The modified code
+        """
+        cache_key = self._cache_key(code, prompt)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Stream the AI response so callers can report progress while
+        # the model is still generating
+        contents, generation_config = self._build_request(code, prompt)
         response = self.model.generate_content(
-            [system_prompt, user_prompt],
-            generation_config=genai.types.GenerationConfig(
-                temperature=0.1,
-                candidate_count=1,
-                max_output_tokens=8192,
-            )
+            contents,
+            generation_config=generation_config,
+            stream=True
+        )
+        parts = []
+        for chunk in response:
+            text = chunk.text
+            parts.append(text)
+            if on_chunk:
+                on_chunk(len(text))
+
+        # Assemble, cache and return the modified code
+        modified = ''.join(parts)
+        self._cache[cache_key] = modified
+        return modified
+
+    async def aprocess(self, code: str, prompt: str,
+                       on_chunk: Optional[Callable[[int], None]] = None) -> str:
+        """
+        Process the code according to the prompt, without blocking.
+
+        Async counterpart of process() so multiple files can be edited
+        concurrently; shares the same response cache.
+
+        Args:
+            code: The original code to modify
+            prompt: Natural language description of desired changes
+            on_chunk: Optional callback invoked with the length of each
+                streamed response chunk, for progress reporting
+
+        Returns:
+            The modified code
+        """
+        cache_key = self._cache_key(code, prompt)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Stream the AI response so callers can report progress while
+        # the model is still generating
+        contents, generation_config = self._build_request(code, prompt)
+        response = await self.model.generate_content_async(
+            contents,
+            generation_config=generation_config,
+            stream=True
         )
+        parts = []
+        async for chunk in response:
+            text = chunk.text
+            parts.append(text)
+            if on_chunk:
+                on_chunk(len(text))
 
-        # Extract and return the modified code
-        return response.text
+        # Assemble, cache and return the modified code
+        modified = ''.join(parts)
+        self._cache[cache_key] = modified
+        return modified
 
     def detect_language(self, file_path: Path) -> Optional[str]:
         """
@@ -83,20 +208,4 @@ Here's the code to modify:
         Returns:
             The detected language or None if unknown
         """
-        extension_map = {
-            '.py': 'python',
-            '.js': 'javascript',
-            '.ts': 'typescript',
-            '.java': 'java',
-            '.cpp': 'cpp',
-            '.c': 'c',
-            '.go': 'go',
-            '.rs': 'rust',
-            '.rb': 'ruby',
-            '.php': 'php',
-            '.cs': 'csharp',
-            '.swift': 'swift',
-            '.kt': 'kotlin',
-            '.scala': 'scala',
-        }
-        return extension_map.get(file_path.suffix.lower()) 
\ No newline at end of file
+        return _EXTENSION_MAP.get(file_path.suffix.lower())
\ No newline at end of file